@@ -6,11 +6,35 @@ A Mac desktop application for tracking options trading using the Wheel Strategy.
 
 import sys
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QSettings
+from PySide6.QtGui import QFont, QFontDatabase
 
 from src.main_window import MainWindow
 
+# Order matters: first available wins
+PREFERRED_FONTS = ("SF Pro Display", "Helvetica Neue", "Segoe UI")
+
+
+def _select_font() -> QFont:
+    """Pick the first available preferred font.
+
+    Enumerates the font database once instead of probing each candidate
+    with exactMatch, and remembers the winner in QSettings so repeat
+    launches skip the enumeration entirely.
+    """
+    settings = QSettings()
+    cached = settings.value("ui/font_family")
+    if cached:
+        return QFont(cached, 13)
+
+    families = set(QFontDatabase.families())
+    for name in PREFERRED_FONTS:
+        if name in families:
+            settings.setValue("ui/font_family", name)
+            return QFont(name, 13)
+
+    return QFont("Segoe UI", 13)
+
 
 def main():
     """Main entry point."""
@@ -27,12 +51,7 @@ def main():
     app.setOrganizationName("WheelTracker")
     
     # Set default font
-    font = QFont("SF Pro Display", 13)
-    if not font.exactMatch():
-        font = QFont("Helvetica Neue", 13)
-    if not font.exactMatch():
-        font = QFont("Segoe UI", 13)
-    app.setFont(font)
+    app.setFont(_select_font())
     
     # Create and show main window
     window = MainWindow()
@@ -8,8 +8,8 @@ from PySide6.QtWidgets import (
     QButtonGroup, QSizePolicy
 )
 from PySide6.QtCore import Qt, QRectF, QPointF
-from PySide6.QtGui import QPainter, QPen, QColor, QBrush, QPainterPath, QLinearGradient
-from ..styles import COLORS, format_currency, format_percent
+from PySide6.QtGui import QPainter, QPen, QBrush, QPainterPath, QLinearGradient
+from ..styles import COLORS, QCOLORS, format_currency, format_percent
 from datetime import datetime, timedelta
 
 
@@ -58,8 +58,8 @@ class LineChart(QWidget):
         # Draw gradient fill
         if points:
             gradient = QLinearGradient(0, margin, 0, margin + height)
-            gradient.setColorAt(0, QColor(COLORS['accent_green']).lighter(150))
-            gradient.setColorAt(1, QColor(COLORS['bg_secondary']))
+            gradient.setColorAt(0, QCOLORS['accent_green'].lighter(150))
+            gradient.setColorAt(1, QCOLORS['bg_secondary'])
             
             fill_path = QPainterPath()
             fill_path.moveTo(points[0].x(), margin + height)
@@ -71,7 +71,7 @@ class LineChart(QWidget):
             painter.fillPath(fill_path, QBrush(gradient))
         
         # Draw line
-        pen = QPen(QColor(COLORS['accent_green']))
+        pen = QPen(QCOLORS['accent_green'])
         pen.setWidth(2)
         painter.setPen(pen)
         
@@ -79,7 +79,7 @@ class LineChart(QWidget):
             painter.drawLine(points[i], points[i + 1])
         
         # Draw points
-        painter.setBrush(QBrush(QColor(COLORS['accent_green'])))
+        painter.setBrush(QBrush(QCOLORS['accent_green']))
         for pt in points:
             painter.drawEllipse(pt, 3, 3)
 
@@ -129,7 +129,7 @@ class BarChart(QWidget):
             y = margin + height - bar_height
             
             # Choose color based on whether it's today's month
-            color = QColor(COLORS['accent_green'])
+            color = QCOLORS['accent_green']
             
             # Draw bar
             painter.setBrush(QBrush(color))
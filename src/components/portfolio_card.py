@@ -289,17 +289,22 @@ class PortfolioCard(QWidget):
         dialog.saved.connect(self.data_changed.emit)
         dialog.exec()
     
-    def refresh_data(self):
-        """Refresh the card with current data."""
+    def refresh_data(self, info: dict = None, milestones: list = None):
+        """Refresh the card with current data.
+
+        Callers that already hold the data (the dashboard snapshot) can
+        pass it in; otherwise the card queries the database itself.
+        """
         # Clear existing content
         while self.content_layout.count():
             item = self.content_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
-        
-        db = get_database()
-        info = db.get_portfolio_info()
-        milestones = db.get_milestones()
+
+        if info is None or milestones is None:
+            db = get_database()
+            info = db.get_portfolio_info()
+            milestones = db.get_milestones()
         
         # Check if there's any data
         has_data = (
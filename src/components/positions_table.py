@@ -3,92 +3,337 @@ Positions table component.
 Displays all positions with covered call and put premiums.
 """
 
+from operator import itemgetter
+
+import numpy as np
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, 
-    QTableWidget, QTableWidgetItem, QHeaderView, QProgressBar,
-    QAbstractItemView
+    QWidget, QVBoxLayout, QFrame,
+    QTableView, QHeaderView, QStyledItemDelegate, QStyle,
+    QStyleOptionViewItem, QAbstractItemView
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QColor
-from ..styles import COLORS, format_currency
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex, QRect
+from PySide6.QtGui import QColor, QPainter, QBrush
+from ..styles import COLORS, QCOLORS, format_currency
 
 
-class PremiumBar(QWidget):
-    """Custom progress bar for showing premium amount."""
-    
-    def __init__(self, value: float, max_value: float, parent=None):
-        super().__init__(parent)
-        self.value = value
-        self.max_value = max_value
-        self.setup_ui()
-    
-    def setup_ui(self):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(8)
-        
+# Shared QColor instances so ForegroundRole and the delegate return the
+# same objects every time instead of parsing hex strings per call.
+_GREEN = QCOLORS['accent_green']
+_MUTED = QCOLORS['text_muted']
+_PRIMARY = QCOLORS['text_primary']
+_BG_PRIMARY = QCOLORS['bg_primary']
+_BG_CARD = QCOLORS['bg_card']
+_BG_HOVER = QCOLORS['bg_hover']
+
+# Stylesheets built once at import; Qt reparses QSS on every
+# setStyleSheet call, so widgets reuse the precomputed strings.
+_CARD_QSS = f"""
+    QFrame#card {{
+        background-color: {COLORS['bg_secondary']};
+        border: 1px solid {COLORS['border']};
+        border-radius: 12px;
+    }}
+"""
+
+_TABLE_QSS = f"""
+    QTableView {{
+        background-color: {COLORS['bg_secondary']};
+        border: none;
+        border-radius: 12px;
+    }}
+    QTableView::item {{
+        padding: 8px;
+        border-bottom: 1px solid {COLORS['border']};
+    }}
+    QTableView::item:selected {{
+        background-color: {COLORS['bg_hover']};
+    }}
+    QTableView::item:alternate {{
+        background-color: {COLORS['bg_card']};
+    }}
+    QHeaderView::section {{
+        background-color: {COLORS['bg_card']};
+        color: {COLORS['text_secondary']};
+        padding: 12px 8px;
+        border: none;
+        border-bottom: 1px solid {COLORS['border']};
+        font-weight: 600;
+        font-size: 12px;
+    }}
+"""
+
+
+class PremiumBarDelegate(QStyledItemDelegate):
+    """Paints the premium value and a proportional bar directly.
+
+    A single delegate replaces the per-row PremiumBar widget tree
+    (QWidget + QHBoxLayout + QLabel + QProgressBar with its own
+    stylesheet), so the table holds no child widgets at all.
+    """
+
+    LABEL_WIDTH = 80
+    BAR_HEIGHT = 8
+
+    def paint(self, painter: QPainter, option, index):
+        bar_data = index.data(Qt.UserRole)
+        if bar_data is None:
+            # Totals row: plain styled text via the model's roles.
+            super().paint(painter, option, index)
+            return
+
+        value, max_value = bar_data
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Background (selection / alternating rows)
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, _BG_HOVER)
+        elif option.features & QStyleOptionViewItem.Alternate:
+            painter.fillRect(option.rect, _BG_CARD)
+
+        rect = option.rect.adjusted(8, 0, -8, 0)
+
         # Value label
-        value_label = QLabel(format_currency(self.value))
-        value_label.setStyleSheet(f"color: {COLORS['accent_green']}; font-weight: 500;")
-        value_label.setFixedWidth(80)
-        layout.addWidget(value_label)
-        
-        # Progress bar
-        if self.max_value > 0:
-            progress = QProgressBar()
-            progress.setMaximum(int(self.max_value))
-            progress.setValue(int(self.value))
-            progress.setTextVisible(False)
-            progress.setFixedHeight(8)
-            progress.setStyleSheet(f"""
-                QProgressBar {{
-                    background-color: {COLORS['bg_primary']};
-                    border: none;
-                    border-radius: 4px;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {COLORS['accent_green']};
-                    border-radius: 4px;
-                }}
-            """)
-            layout.addWidget(progress, 1)
-        else:
-            layout.addStretch()
+        text_rect = QRect(rect.left(), rect.top(), self.LABEL_WIDTH, rect.height())
+        painter.setPen(_GREEN)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, format_currency(value))
+
+        # Bar scaled against the largest position premium
+        if max_value > 0:
+            bar_rect = QRect(
+                text_rect.right() + 8,
+                rect.center().y() - self.BAR_HEIGHT // 2,
+                rect.right() - text_rect.right() - 8,
+                self.BAR_HEIGHT
+            )
+            if bar_rect.width() > 0:
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(QBrush(_BG_PRIMARY))
+                painter.drawRoundedRect(bar_rect, 4, 4)
+
+                fill_width = int(bar_rect.width() * min(value / max_value, 1.0))
+                if fill_width > 0:
+                    painter.setBrush(QBrush(_GREEN))
+                    painter.drawRoundedRect(
+                        QRect(bar_rect.left(), bar_rect.top(), fill_width, bar_rect.height()),
+                        4, 4
+                    )
+
+        painter.restore()
+
+
+class PositionsModel(QAbstractTableModel):
+    """Table model exposing positions plus a trailing totals row.
+
+    Backed directly by the list of position dicts from the database, so a
+    refresh is a single model reset instead of per-cell widget churn; the
+    view only queries data() for visible cells.
+    """
+
+    HEADERS = ("Ticker", "Covered Call", "PUT", "Total Premium")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._positions = []
+        self._totals = {'cc_premium': 0, 'csp_premium': 0, 'total_premium': 0}
+        self._max_total = 1
+        # Qt re-queries data() for every visible cell on each scroll/repaint;
+        # memoize the pure formatting work per (row, column).
+        self._display_cache: dict[tuple[int, int], str] = {}
+        self._fg_cache: dict[tuple[int, int], QColor] = {}
+
+    def set_positions(self, positions: list[dict]):
+        """Update the model contents, recomputing totals vectorized.
+
+        When the new list keeps the existing tickers in place (the common
+        refresh), only changed rows emit dataChanged and appended tickers
+        are inserted, so the view repaints O(changed) cells and keeps
+        selection and scroll state. Removals and reorders fall back to a
+        full reset.
+        """
+        # The positions query COALESCEs every premium column, so the keys
+        # are always present and itemgetter runs the extraction in C.
+        count = len(positions)
+        cc = np.fromiter(map(itemgetter('cc_premium'), positions),
+                         dtype=np.float64, count=count)
+        put = np.fromiter(map(itemgetter('csp_premium'), positions),
+                          dtype=np.float64, count=count)
+        total = np.fromiter(map(itemgetter('total_premium'), positions),
+                            dtype=np.float64, count=count)
+
+        totals = {
+            'cc_premium': float(cc.sum()),
+            'csp_premium': float(put.sum()),
+            'total_premium': float(total.sum()),
+        }
+        max_total = max(float(total.max()) if count else 0.0, 1.0)
+
+        old = self._positions
+        n_old = len(old)
+        incremental = (
+            count >= n_old
+            and all(old[i]['ticker'] == positions[i]['ticker'] for i in range(n_old))
+        )
+
+        if not incremental:
+            self.beginResetModel()
+            self._display_cache.clear()
+            self._fg_cache.clear()
+            self._positions = positions
+            self._totals = totals
+            self._max_total = max_total
+            self.endResetModel()
+            return
+
+        changed_rows = [
+            row for row in range(n_old)
+            if any(old[row][field] != positions[row][field]
+                   for field in ('cc_premium', 'csp_premium', 'total_premium'))
+        ]
+        appending = count > n_old
+        max_changed = max_total != self._max_total
+
+        # Drop stale cache entries from the first changed row down; this
+        # always covers the totals row, which shifts when rows are appended.
+        self._purge_rows_from(min(changed_rows, default=n_old))
+
+        if appending:
+            self.beginInsertRows(QModelIndex(), n_old, count - 1)
+        self._positions = positions
+        self._totals = totals
+        self._max_total = max_total
+        if appending:
+            self.endInsertRows()
+
+        for row in changed_rows:
+            self.dataChanged.emit(
+                self.index(row, 0), self.index(row, 3),
+                [Qt.DisplayRole, Qt.ForegroundRole]
+            )
+        if max_changed and count:
+            # Bars are scaled against the max premium; repaint the column
+            self.dataChanged.emit(self.index(0, 3), self.index(count - 1, 3), [])
+        self.dataChanged.emit(self.index(count, 0), self.index(count, 3), [])
+
+    def _purge_rows_from(self, row: int):
+        """Drop cached display strings and colors from a row downward."""
+        for cache in (self._display_cache, self._fg_cache):
+            for key in [k for k in cache if k[0] >= row]:
+                del cache[key]
+
+    def position_at(self, row: int) -> dict:
+        """Get the position dict behind a row (excluding the totals row)."""
+        if 0 <= row < len(self._positions):
+            return self._positions[row]
+        return None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._positions) + 1  # +1 for total row
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        row = index.row()
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            key = (row, col)
+            cached = self._display_cache.get(key)
+            if cached is None:
+                cached = self._format_cell(row, col)
+                self._display_cache[key] = cached
+            return cached
+
+        elif role == Qt.ForegroundRole:
+            key = (row, col)
+            cached = self._fg_cache.get(key)
+            if cached is None:
+                cached = self._foreground_for(row, col)
+                self._fg_cache[key] = cached
+            return cached
+
+        elif role == Qt.TextAlignmentRole:
+            if col > 0:
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+
+        elif role == Qt.UserRole:
+            # (value, max_value) for the premium bar delegate; the totals
+            # row returns None so it falls back to plain text.
+            if col == 3 and row < len(self._positions):
+                return (self._positions[row]['total_premium'], self._max_total)
+
+        return None
+
+    def _format_cell(self, row: int, col: int) -> str:
+        """Compute the display string for a cell (cached by data())."""
+        is_total_row = row == len(self._positions)
+        pos = self._totals if is_total_row else self._positions[row]
+
+        if col == 0:
+            return "TOTAL" if is_total_row else pos['ticker']
+        if col == 1:
+            cc = pos['cc_premium']
+            return format_currency(cc) if is_total_row or cc > 0 else "-"
+        if col == 2:
+            put = pos['csp_premium']
+            return format_currency(put) if is_total_row or put > 0 else "-"
+        return format_currency(pos['total_premium'])
+
+    def _foreground_for(self, row: int, col: int) -> QColor:
+        """Pick the shared foreground color for a cell (cached by data())."""
+        is_total_row = row == len(self._positions)
+        pos = self._totals if is_total_row else self._positions[row]
+
+        if col == 0:
+            return _PRIMARY
+        if col == 1:
+            return _GREEN if is_total_row or pos['cc_premium'] > 0 else _MUTED
+        if col == 2:
+            return _GREEN if is_total_row or pos['csp_premium'] > 0 else _MUTED
+        return _GREEN
 
 
 class PositionsTable(QWidget):
     """Table showing all positions with premium breakdown."""
-    
+
     position_selected = Signal(dict)
-    
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.positions_data = []
+        self._model = PositionsModel(self)
         self.setup_ui()
-    
+
     def setup_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        
+
         # Main card frame
         card = QFrame()
         card.setObjectName("card")
-        card.setStyleSheet(f"""
-            QFrame#card {{
-                background-color: {COLORS['bg_secondary']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 12px;
-            }}
-        """)
-        
+        card.setStyleSheet(_CARD_QSS)
+
         card_layout = QVBoxLayout(card)
         card_layout.setSpacing(0)
         card_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Create table
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Ticker", "Covered Call", "PUT", "Total Premium"])
+
+        # Create table view backed by the positions model
+        self.table = QTableView()
+        self.table.setModel(self._model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
         self.table.setColumnWidth(0, 80)
@@ -97,118 +342,55 @@ class PositionsTable(QWidget):
         self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
-        
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
-                background-color: {COLORS['bg_secondary']};
-                border: none;
-                border-radius: 12px;
-            }}
-            QTableWidget::item {{
-                padding: 8px;
-                border-bottom: 1px solid {COLORS['border']};
-            }}
-            QTableWidget::item:selected {{
-                background-color: {COLORS['bg_hover']};
-            }}
-            QTableWidget::item:alternate {{
-                background-color: {COLORS['bg_card']};
-            }}
-            QHeaderView::section {{
-                background-color: {COLORS['bg_card']};
-                color: {COLORS['text_secondary']};
-                padding: 12px 8px;
-                border: none;
-                border-bottom: 1px solid {COLORS['border']};
-                font-weight: 600;
-                font-size: 12px;
-            }}
-        """)
-        
-        self.table.itemSelectionChanged.connect(self._on_selection_changed)
-        
+        self.table.setItemDelegateForColumn(3, PremiumBarDelegate(self.table))
+
+        self.table.setStyleSheet(_TABLE_QSS)
+
+        self.table.selectionModel().selectionChanged.connect(self._on_selection_changed)
+
         card_layout.addWidget(self.table)
         layout.addWidget(card)
-    
-    def _on_selection_changed(self):
+
+    def _on_selection_changed(self, selected, deselected):
         """Handle row selection."""
         rows = self.table.selectionModel().selectedRows()
-        if rows and self.positions_data:
-            row_idx = rows[0].row()
-            if row_idx < len(self.positions_data):
-                self.position_selected.emit(self.positions_data[row_idx])
-    
+        if rows:
+            position = self._model.position_at(rows[0].row())
+            if position is not None:
+                self.position_selected.emit(position)
+
     def update_data(self, positions: list[dict]):
         """Update the table with position data."""
         self.positions_data = positions
-        self.table.setRowCount(len(positions) + 1)  # +1 for total row
-        
-        # Find max total for progress bar scaling
-        max_total = max((p.get('total_premium', 0) for p in positions), default=1) or 1
-        
-        total_cc = 0
-        total_put = 0
-        total_premium = 0
-        
-        for row, pos in enumerate(positions):
-            ticker = pos.get('ticker', '')
-            cc = pos.get('cc_premium', 0)
-            put = pos.get('csp_premium', 0)
-            total = pos.get('total_premium', 0)
-            
-            total_cc += cc
-            total_put += put
-            total_premium += total
-            
-            # Ticker
-            ticker_item = QTableWidgetItem(ticker)
-            ticker_item.setForeground(QColor(COLORS['text_primary']))
-            ticker_item.setFlags(ticker_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 0, ticker_item)
-            
-            # Covered Call
-            cc_item = QTableWidgetItem(format_currency(cc) if cc > 0 else "-")
-            cc_item.setForeground(QColor(COLORS['accent_green'] if cc > 0 else COLORS['text_muted']))
-            cc_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            cc_item.setFlags(cc_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 1, cc_item)
-            
-            # PUT
-            put_item = QTableWidgetItem(format_currency(put) if put > 0 else "-")
-            put_item.setForeground(QColor(COLORS['accent_green'] if put > 0 else COLORS['text_muted']))
-            put_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            put_item.setFlags(put_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 2, put_item)
-            
-            # Total Premium with bar
-            total_item = QTableWidgetItem(format_currency(total))
-            total_item.setForeground(QColor(COLORS['accent_green']))
-            total_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            total_item.setFlags(total_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 3, total_item)
-        
-        # Total row
-        total_row = len(positions)
-        
-        total_label = QTableWidgetItem("TOTAL")
-        total_label.setForeground(QColor(COLORS['text_primary']))
-        total_label.setFlags(total_label.flags() & ~Qt.ItemIsEditable)
-        self.table.setItem(total_row, 0, total_label)
-        
-        total_cc_item = QTableWidgetItem(format_currency(total_cc))
-        total_cc_item.setForeground(QColor(COLORS['accent_green']))
-        total_cc_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        total_cc_item.setFlags(total_cc_item.flags() & ~Qt.ItemIsEditable)
-        self.table.setItem(total_row, 1, total_cc_item)
-        
-        total_put_item = QTableWidgetItem(format_currency(total_put))
-        total_put_item.setForeground(QColor(COLORS['accent_green']))
-        total_put_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        total_put_item.setFlags(total_put_item.flags() & ~Qt.ItemIsEditable)
-        self.table.setItem(total_row, 2, total_put_item)
-        
-        total_premium_item = QTableWidgetItem(format_currency(total_premium))
-        total_premium_item.setForeground(QColor(COLORS['accent_green']))
-        total_premium_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        total_premium_item.setFlags(total_premium_item.flags() & ~Qt.ItemIsEditable)
-        self.table.setItem(total_row, 3, total_premium_item)
+
+        # Incremental updates keep selection as-is; a full model reset
+        # drops it, so remember the selected ticker and restore it after.
+        sel_model = self.table.selectionModel()
+        selected_ticker = None
+        rows = sel_model.selectedRows()
+        if rows:
+            selected = self._model.position_at(rows[0].row())
+            if selected is not None:
+                selected_ticker = selected.get('ticker')
+
+        # Suppress repaints and selection-change signals while the model
+        # resets, so the refresh costs a single repaint at the end.
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            self._model.set_positions(positions)
+            if selected_ticker is not None and not sel_model.hasSelection():
+                for row, position in enumerate(positions):
+                    if position.get('ticker') == selected_ticker:
+                        # Re-selecting the same position is not a change;
+                        # keep position_selected quiet during the restore.
+                        sel_model.blockSignals(True)
+                        try:
+                            self.table.selectRow(row)
+                        finally:
+                            sel_model.blockSignals(False)
+                        break
+        finally:
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+            self.table.viewport().update()
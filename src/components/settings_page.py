@@ -13,6 +13,49 @@ from ..lib.database import get_database
 from ..lib.polygon_api import PolygonAPI, refresh_polygon_api, TIER_FEATURES
 
 
+# Stylesheets built once at import; Qt reparses QSS on every
+# setStyleSheet call, so page construction reuses the precomputed strings.
+_TITLE_QSS = f"""
+    font-size: 28px;
+    font-weight: 700;
+    color: {COLORS['text_primary']};
+"""
+
+_GROUP_QSS = f"""
+    QGroupBox {{
+        background-color: {COLORS['bg_secondary']};
+        border: 1px solid {COLORS['border']};
+        border-radius: 12px;
+        margin-top: 20px;
+        padding: 20px;
+        font-size: 16px;
+        font-weight: 600;
+        color: {COLORS['text_primary']};
+    }}
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        padding: 0 12px;
+        background-color: {COLORS['bg_secondary']};
+    }}
+"""
+
+_SAVE_BTN_QSS = f"""
+    QPushButton#primary {{
+        background-color: {COLORS['accent_green_dark']};
+        border: none;
+        color: {COLORS['bg_dark']};
+        font-weight: 600;
+        padding: 12px 32px;
+        border-radius: 8px;
+        font-size: 14px;
+    }}
+    QPushButton#primary:hover {{
+        background-color: {COLORS['accent_green']};
+    }}
+"""
+
+
 class SettingsPage(QWidget):
     """Settings page for app configuration."""
     
@@ -20,9 +63,17 @@ class SettingsPage(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setup_ui()
-        self._load_settings()
-    
+        # Built lazily on first show: most sessions never open Settings,
+        # so cold start skips the group boxes and tier table entirely.
+        self._built = False
+
+    def showEvent(self, event):
+        if not self._built:
+            self.setup_ui()
+            self._load_settings()
+            self._built = True
+        super().showEvent(event)
+
     def setup_ui(self):
         layout = QVBoxLayout(self)
         layout.setSpacing(24)
@@ -30,33 +81,12 @@ class SettingsPage(QWidget):
         
         # Title
         title = QLabel("Settings")
-        title.setStyleSheet(f"""
-            font-size: 28px;
-            font-weight: 700;
-            color: {COLORS['text_primary']};
-        """)
+        title.setStyleSheet(_TITLE_QSS)
         layout.addWidget(title)
-        
+
         # Polygon.io API Section
         api_group = QGroupBox("Polygon.io API")
-        api_group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {COLORS['bg_secondary']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 12px;
-                margin-top: 20px;
-                padding: 20px;
-                font-size: 16px;
-                font-weight: 600;
-                color: {COLORS['text_primary']};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 12px;
-                background-color: {COLORS['bg_secondary']};
-            }}
-        """)
+        api_group.setStyleSheet(_GROUP_QSS)
         
         api_layout = QFormLayout(api_group)
         api_layout.setSpacing(16)
@@ -109,24 +139,7 @@ class SettingsPage(QWidget):
         
         # Tier comparison
         tier_info = QGroupBox("Tier Comparison")
-        tier_info.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {COLORS['bg_secondary']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 12px;
-                margin-top: 20px;
-                padding: 20px;
-                font-size: 16px;
-                font-weight: 600;
-                color: {COLORS['text_primary']};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 12px;
-                background-color: {COLORS['bg_secondary']};
-            }}
-        """)
+        tier_info.setStyleSheet(_GROUP_QSS)
         
         tier_layout = QVBoxLayout(tier_info)
         tier_layout.setSpacing(12)
@@ -172,20 +185,7 @@ class SettingsPage(QWidget):
         
         save_btn = QPushButton("Save Settings")
         save_btn.setObjectName("primary")
-        save_btn.setStyleSheet(f"""
-            QPushButton#primary {{
-                background-color: {COLORS['accent_green_dark']};
-                border: none;
-                color: {COLORS['bg_dark']};
-                font-weight: 600;
-                padding: 12px 32px;
-                border-radius: 8px;
-                font-size: 14px;
-            }}
-            QPushButton#primary:hover {{
-                background-color: {COLORS['accent_green']};
-            }}
-        """)
+        save_btn.setStyleSheet(_SAVE_BTN_QSS)
         save_btn.clicked.connect(self._save_settings)
         button_layout.addWidget(save_btn)
         
@@ -5,12 +5,26 @@ Supports demo mode with sample data and active mode for real data.
 """
 
 import sqlite3
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime, date, timedelta
 from typing import Optional
 import random
 
 
+@dataclass(slots=True, frozen=True)
+class DashboardSnapshot:
+    """Everything a dashboard refresh reads, fetched in one pass."""
+
+    premium: dict
+    positions: list[dict]
+    mtd: list[dict]
+    ytd: list[dict]
+    portfolio_info: dict
+    milestones: list[dict]
+    total_premium: float
+
+
 class Database:
     """Database handler for the Wheel Strategy Tracker."""
     
@@ -315,6 +329,19 @@ class Database:
         cursor.execute(query, params)
         return [dict(row) for row in cursor.fetchall()]
     
+    def iter_all_trades(self) -> tuple[list[str], sqlite3.Cursor]:
+        """Stream all trades for export.
+
+        Returns the column names and a cursor yielding plain tuples, so
+        callers can write rows out without building dicts or holding the
+        whole history in memory.
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute("SELECT * FROM trades ORDER BY opened_at DESC")
+        columns = [d[0] for d in cursor.description]
+        return columns, cursor
+
     def get_trades_for_position(self, position_id: int) -> list[dict]:
         """Get all trades for a position."""
         cursor = self.conn.cursor()
@@ -472,6 +499,17 @@ class Database:
             'first_trade_date': first_trade
         }
     
+    def get_total_premium(self) -> float:
+        """Get the total collected premium across all positions."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT COALESCE(SUM(premium * quantity * 100), 0) as total
+            FROM trades
+            WHERE type IN ('CC', 'CSP')
+            AND status != 'OPEN'
+        """)
+        return cursor.fetchone()['total']
+
     def get_top_performers(self, period: str = 'mtd', limit: int = 5) -> list[dict]:
         """Get top performing tickers by premium."""
         cursor = self.conn.cursor()
@@ -495,6 +533,25 @@ class Database:
         
         return [dict(row) for row in cursor.fetchall()]
     
+    # ==================== DASHBOARD ====================
+
+    def get_dashboard_snapshot(self) -> DashboardSnapshot:
+        """Run all the dashboard refresh queries in one batch.
+
+        The refresh path used to issue these SELECTs as separate calls
+        from the window; batching them here keeps the whole read set on
+        one cursor pass and gives callers a single immutable result.
+        """
+        return DashboardSnapshot(
+            premium=self.get_premium_summary(),
+            positions=self.get_all_positions(),
+            mtd=self.get_top_performers('mtd', 5),
+            ytd=self.get_top_performers('ytd', 5),
+            portfolio_info=self.get_portfolio_info(),
+            milestones=self.get_milestones(),
+            total_premium=self.get_total_premium(),
+        )
+
     # ==================== SETTINGS ====================
     
     def get_setting(self, key: str) -> Optional[str]:
@@ -3,12 +3,167 @@ Polygon.io API client for market data.
 Supports tiered access with feature gating based on subscription level.
 """
 
+import pickle
+import sqlite3
+import threading
+import time
+import numpy as np
 import requests
-from typing import Optional
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter, Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+from datetime import date, timedelta
 from .database import get_database
 
 
+@dataclass(slots=True, frozen=True)
+class OHLCV:
+    """One day's bar for a ticker — a compact struct instead of a dict."""
+    ticker: str
+    close: float
+    open: float
+    high: float
+    low: float
+    volume: float
+    vwap: float
+    timestamp: int
+
+
+@dataclass(slots=True, frozen=True)
+class CacheEntry:
+    """A cached payload with freshness flag and HTTP validators."""
+    value: Any
+    fresh: bool
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class _DiskCache:
+    """SQLite-backed response cache with per-entry TTL.
+
+    Persists across app restarts and API instance refreshes, and stays
+    bounded instead of accumulating entries for the life of the process.
+    Expired entries are kept for a grace window so their HTTP validators
+    (ETag / Last-Modified) can still be used for conditional refetches.
+    """
+
+    __slots__ = ("conn", "_lock")
+
+    MAX_ENTRIES = 4096
+    EXPIRED_GRACE_SECONDS = 7 * 86400
+
+    def __init__(self, db_path: str):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expiry REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        """)
+        # Migrate cache files created before validator columns existed
+        for column in ("etag", "last_modified"):
+            try:
+                self.conn.execute(f"ALTER TABLE cache ADD COLUMN {column} TEXT")
+            except sqlite3.OperationalError:
+                pass
+        self.conn.commit()
+
+    def get(self, key: str):
+        """Get a cached value, or None if missing or expired."""
+        entry = self.get_entry(key)
+        if entry is None or not entry.fresh:
+            return None
+        return entry.value
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Get a cache entry with freshness flag and HTTP validators."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, expiry, etag, last_modified FROM cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            # Corrupt blob, or an entry pickled by a build whose classes
+            # have since changed shape; drop it and report a miss.
+            self.delete(key)
+            return None
+        return CacheEntry(
+            value=value,
+            fresh=time.time() < row[1],
+            etag=row[2],
+            last_modified=row[3],
+        )
+
+    def set(self, key: str, value, ttl_seconds: int,
+            etag: str = None, last_modified: str = None):
+        """Store a value with an expiry, pruning stale entries."""
+        blob = pickle.dumps(value)
+        now = time.time()
+        with self._lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO cache (key, value, expiry, etag, last_modified)
+                VALUES (?, ?, ?, ?, ?)
+            """, (key, blob, now + ttl_seconds, etag, last_modified))
+            self.conn.execute(
+                "DELETE FROM cache WHERE expiry <= ?",
+                (now - self.EXPIRED_GRACE_SECONDS,)
+            )
+            self.conn.execute("""
+                DELETE FROM cache WHERE key IN (
+                    SELECT key FROM cache ORDER BY expiry DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.MAX_ENTRIES,))
+            self.conn.commit()
+
+    def delete(self, key: str):
+        """Remove an entry (e.g. one that failed to unpickle)."""
+        with self._lock:
+            self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self.conn.commit()
+
+    def touch(self, key: str, ttl_seconds: int):
+        """Extend an entry's expiry after a 304 revalidation."""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE cache SET expiry = ? WHERE key = ?",
+                (time.time() + ttl_seconds, key)
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def _compute_returns(start_closes: np.ndarray, end_closes: np.ndarray) -> np.ndarray:
+    """Percentage returns for parallel arrays of start/end closes.
+
+    One vectorized pass over all series, with zero (or missing) start
+    prices yielding 0.0 — stays cheap if extended from the four indices
+    to a large watchlist or backtest universe.
+    """
+    out = np.zeros(start_closes.shape[0], dtype=np.float64)
+    valid = start_closes > 0
+    out[valid] = (end_closes[valid] - start_closes[valid]) / start_closes[valid] * 100.0
+    return out
+
+
+def _cache_path() -> str:
+    """Path to the shared Polygon response cache."""
+    data_dir = Path(__file__).parent.parent.parent / "data"
+    data_dir.mkdir(exist_ok=True)
+    return str(data_dir / "polygon_cache.db")
+
+
 # Features available per tier
 TIER_FEATURES = {
     'free': ['endOfDayPrices', 'tickerSearch'],
@@ -20,14 +175,38 @@ TIER_FEATURES = {
 
 class PolygonAPI:
     """Polygon.io API client with tier-aware feature gating."""
-    
+
+    __slots__ = ("api_key", "tier", "_cache", "_today_str", "_today_ts", "_session")
+
     BASE_URL = "https://api.polygon.io"
     
     def __init__(self, api_key: str = "", tier: str = "free"):
         self.api_key = api_key
         self.tier = tier
-        self._cache = {}
-        self._cache_expiry = {}
+        self._cache = _DiskCache(_cache_path())
+        self._today_str = None
+        self._today_ts = 0.0
+
+        # Pooled session so repeat requests reuse TCP+TLS connections
+        # instead of paying a fresh handshake per call.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+        if api_key:
+            # Bearer auth keeps the key out of query strings
+            self._session.headers['Authorization'] = f"Bearer {api_key}"
+
+    def close(self):
+        """Close the underlying HTTP session and cache store."""
+        self._session.close()
+        self._cache.close()
     
     @property
     def available_features(self) -> list[str]:
@@ -40,32 +219,64 @@ class PolygonAPI:
     
     def _make_request(self, endpoint: str, params: dict = None) -> Optional[dict]:
         """Make an API request."""
+        result, _, _, _ = self._make_conditional_request(endpoint, params)
+        return result
+
+    def _make_conditional_request(self, endpoint: str, params: dict = None,
+                                  etag: str = None, last_modified: str = None
+                                  ) -> tuple[Optional[dict], Optional[str], Optional[str], bool]:
+        """Make an API request, optionally validating a cached copy.
+
+        Returns (json, etag, last_modified, not_modified). When validators
+        are passed and the server answers 304, json is None and
+        not_modified is True — the caller's cached payload is still good.
+        """
         if not self.api_key:
-            return None
-        
-        if params is None:
-            params = {}
-        params['apiKey'] = self.api_key
-        
+            return None, None, None, False
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
         try:
-            response = requests.get(f"{self.BASE_URL}{endpoint}", params=params, timeout=10)
+            response = self._session.get(
+                f"{self.BASE_URL}{endpoint}",
+                params=params, headers=headers or None, timeout=10
+            )
+            if response.status_code == 304:
+                return None, etag, last_modified, True
             response.raise_for_status()
-            return response.json()
+            return (
+                response.json(),
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                False
+            )
         except requests.exceptions.RequestException as e:
             print(f"Polygon API error: {e}")
-            return None
+            return None, None, None, False
     
+    def _today_iso(self) -> str:
+        """Today's ISO date string, cached for up to an hour.
+
+        Keeps per-call date formatting off the aggregate-bars hot path;
+        isoformat() is also cheaper than strftime when a refresh is due.
+        """
+        now = time.monotonic()
+        if self._today_str is None or now - self._today_ts > 3600:
+            self._today_str = date.today().isoformat()
+            self._today_ts = now
+        return self._today_str
+
     def _get_cached(self, cache_key: str, ttl_seconds: int = 300):
         """Get cached value if not expired."""
-        if cache_key in self._cache:
-            if datetime.now() < self._cache_expiry.get(cache_key, datetime.min):
-                return self._cache[cache_key]
-        return None
-    
+        return self._cache.get(cache_key)
+
     def _set_cached(self, cache_key: str, value, ttl_seconds: int = 300):
         """Set cached value with expiry."""
-        self._cache[cache_key] = value
-        self._cache_expiry[cache_key] = datetime.now() + timedelta(seconds=ttl_seconds)
+        self._cache.set(cache_key, value, ttl_seconds)
     
     def test_connection(self) -> tuple[bool, str]:
         """Test API connection and return status."""
@@ -84,14 +295,25 @@ class PolygonAPI:
     def get_ticker_details(self, ticker: str) -> Optional[dict]:
         """Get ticker details (company info)."""
         cache_key = f"ticker_details_{ticker}"
-        cached = self._get_cached(cache_key, 86400)  # Cache for 24 hours
-        if cached:
-            return cached
-        
-        result = self._make_request(f"/v3/reference/tickers/{ticker.upper()}")
+        ttl = 86400  # Cache for 24 hours
+        entry = self._cache.get_entry(cache_key)
+        if entry and entry.fresh:
+            return entry.value
+
+        # Revalidate an expired entry when the server gave us validators;
+        # a 304 skips the response body entirely.
+        etag = entry.etag if entry else None
+        last_modified = entry.last_modified if entry else None
+        result, etag, last_modified, not_modified = self._make_conditional_request(
+            f"/v3/reference/tickers/{ticker.upper()}",
+            etag=etag, last_modified=last_modified
+        )
+        if not_modified:
+            self._cache.touch(cache_key, ttl)
+            return entry.value
         if result and result.get('status') == 'OK':
             data = result.get('results', {})
-            self._set_cached(cache_key, data, 86400)
+            self._cache.set(cache_key, data, ttl, etag=etag, last_modified=last_modified)
             return data
         return None
     
@@ -111,31 +333,40 @@ class PolygonAPI:
             return result.get('results', [])
         return []
     
-    def get_previous_close(self, ticker: str) -> Optional[dict]:
+    def get_previous_close(self, ticker: str) -> Optional[OHLCV]:
         """Get previous day close data (free tier)."""
         if not self.has_feature('endOfDayPrices'):
             return None
         
         cache_key = f"prev_close_{ticker}"
-        cached = self._get_cached(cache_key, 3600)  # Cache for 1 hour
-        if cached:
-            return cached
-        
-        result = self._make_request(f"/v2/aggs/ticker/{ticker.upper()}/prev")
+        ttl = 3600  # Cache for 1 hour
+        entry = self._cache.get_entry(cache_key)
+        if entry and entry.fresh:
+            return entry.value
+
+        etag = entry.etag if entry else None
+        last_modified = entry.last_modified if entry else None
+        result, etag, last_modified, not_modified = self._make_conditional_request(
+            f"/v2/aggs/ticker/{ticker.upper()}/prev",
+            etag=etag, last_modified=last_modified
+        )
+        if not_modified:
+            self._cache.touch(cache_key, ttl)
+            return entry.value
         if result and result.get('status') == 'OK':
             results = result.get('results', [])
             if results:
-                data = {
-                    'ticker': ticker.upper(),
-                    'close': results[0].get('c'),
-                    'open': results[0].get('o'),
-                    'high': results[0].get('h'),
-                    'low': results[0].get('l'),
-                    'volume': results[0].get('v'),
-                    'vwap': results[0].get('vw'),
-                    'timestamp': results[0].get('t')
-                }
-                self._set_cached(cache_key, data, 3600)
+                data = OHLCV(
+                    ticker=ticker.upper(),
+                    close=results[0].get('c'),
+                    open=results[0].get('o'),
+                    high=results[0].get('h'),
+                    low=results[0].get('l'),
+                    volume=results[0].get('v'),
+                    vwap=results[0].get('vw'),
+                    timestamp=results[0].get('t')
+                )
+                self._cache.set(cache_key, data, ttl, etag=etag, last_modified=last_modified)
                 return data
         return None
     
@@ -150,8 +381,8 @@ class PolygonAPI:
         # Fall back to previous close
         prev = self.get_previous_close(ticker)
         if prev:
-            return prev.get('close')
-        
+            return prev.close
+
         return None
     
     def get_aggregate_bars(self, ticker: str, timespan: str = "day", 
@@ -162,9 +393,9 @@ class PolygonAPI:
             return []
         
         if to_date is None:
-            to_date = datetime.now().strftime("%Y-%m-%d")
+            to_date = self._today_iso()
         if from_date is None:
-            from_date = (datetime.now() - timedelta(days=limit)).strftime("%Y-%m-%d")
+            from_date = (date.fromisoformat(self._today_iso()) - timedelta(days=limit)).isoformat()
         
         result = self._make_request(
             f"/v2/aggs/ticker/{ticker.upper()}/range/1/{timespan}/{from_date}/{to_date}",
@@ -174,7 +405,26 @@ class PolygonAPI:
         if result and result.get('status') == 'OK':
             return result.get('results', [])
         return []
-    
+
+    def get_aggregate_series(self, ticker: str, timespan: str = "day",
+                             from_date: str = None, to_date: str = None,
+                             limit: int = 120) -> dict[str, np.ndarray]:
+        """Get aggregate bars as column arrays keyed by Polygon field.
+
+        Structure-of-arrays counterpart to get_aggregate_bars: one numpy
+        array per field ('c', 'o', 'h', 'l', 'v', 'vw', 't') so numeric
+        consumers like _compute_returns work on the data directly instead
+        of walking a list of per-bar dicts.
+        """
+        bars = self.get_aggregate_bars(ticker, timespan, from_date, to_date, limit)
+        if not bars:
+            return {}
+        return {
+            field: np.fromiter((bar.get(field, 0) or 0 for bar in bars),
+                               dtype=np.float64, count=len(bars))
+            for field in ('c', 'o', 'h', 'l', 'v', 'vw', 't')
+        }
+
     # ==================== OPTIONS DATA (Paid Tiers) ====================
     
     def get_options_chain(self, ticker: str, expiration_date: str = None,
@@ -209,9 +459,57 @@ class PolygonAPI:
             if results:
                 return results[0]
         return None
+
+    def get_option_contracts(self, options_tickers: list[str]) -> dict[str, Optional[dict]]:
+        """Get details for several option contracts in one batch.
+
+        Overlaps the per-contract snapshot requests on the session's
+        connection pool, so scanning a portfolio of K contracts costs
+        roughly one round trip instead of K serial ones.
+        """
+        if not self.has_feature('optionsChain') or not options_tickers:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(8, len(options_tickers))) as executor:
+            futures = {
+                executor.submit(self.get_option_contract, ticker): ticker
+                for ticker in options_tickers
+            }
+            return {futures[future]: future.result() for future in as_completed(futures)}
     
     # ==================== MARKET INDICES ====================
-    
+
+    def _get_grouped_daily(self, date_str: str) -> dict[str, dict]:
+        """Get the grouped daily bars for all US stocks on one date.
+
+        One request covers every ticker, so a whole watchlist costs O(1)
+        requests per date. Keyed by ticker symbol; cached 24 hours (one
+        hour for empty responses, e.g. non-trading days).
+        """
+        cache_key = f"grouped_daily_{date_str}"
+        cached = self._get_cached(cache_key, 86400)
+        if cached is not None:
+            return cached
+
+        result = self._make_request(
+            f"/v2/aggs/grouped/locale/us/market/stocks/{date_str}",
+            {"adjusted": "true"}
+        )
+        if result and result.get('status') == 'OK':
+            grouped = {r['T']: r for r in result.get('results', [])}
+            self._set_cached(cache_key, grouped, 86400 if grouped else 3600)
+            return grouped
+        return {}
+
+    def _grouped_daily_near(self, date_str: str, lookback: int = 3) -> dict[str, dict]:
+        """Grouped daily bars for a date, walking back over non-trading days."""
+        day = date.fromisoformat(date_str)
+        for offset in range(lookback + 1):
+            grouped = self._get_grouped_daily((day - timedelta(days=offset)).isoformat())
+            if grouped:
+                return grouped
+        return {}
+
     def get_index_performance(self, days: int = 365) -> dict:
         """Get performance data for major indices."""
         indices = {
@@ -220,23 +518,57 @@ class PolygonAPI:
             'IWM': 'Russell 2000',
             'DIA': 'Dow Jones'
         }
-        
+
+        # Two grouped-daily snapshots bound the window for every index at
+        # once — 2 requests total regardless of ticker count.
+        to_date = self._today_iso()
+        from_date = (date.fromisoformat(to_date) - timedelta(days=days)).isoformat()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            start_future = executor.submit(self._grouped_daily_near, from_date)
+            end_future = executor.submit(self._grouped_daily_near, to_date)
+            start_snapshot = start_future.result()
+            end_snapshot = end_future.result()
+
+        if start_snapshot and end_snapshot:
+            series = [
+                (symbol, name,
+                 start_snapshot.get(symbol, {}).get('c', 0),
+                 end_snapshot.get(symbol, {}).get('c', 0))
+                for symbol, name in indices.items()
+            ]
+            series = [s for s in series if s[2] and s[3]]
+        else:
+            # Grouped data unavailable (e.g. plan restriction): fall back
+            # to one parallel aggregate-bars request per index.
+            series = []
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {
+                    executor.submit(self.get_aggregate_bars, symbol, "day", limit=days): (symbol, name)
+                    for symbol, name in indices.items()
+                }
+
+                for future in as_completed(futures):
+                    symbol, name = futures[future]
+                    bars = future.result()
+                    if bars and len(bars) >= 2:
+                        series.append((symbol, name, bars[0].get('c', 0), bars[-1].get('c', 0)))
+
+        if not series:
+            return {}
+
+        start_closes = np.fromiter((s[2] for s in series), dtype=np.float64, count=len(series))
+        end_closes = np.fromiter((s[3] for s in series), dtype=np.float64, count=len(series))
+        returns = _compute_returns(start_closes, end_closes)
+
         performance = {}
-        
-        for symbol, name in indices.items():
-            bars = self.get_aggregate_bars(symbol, "day", limit=days)
-            if bars and len(bars) >= 2:
-                start_price = bars[0].get('c', 0)
-                end_price = bars[-1].get('c', 0)
-                
-                if start_price > 0:
-                    ytd_return = ((end_price - start_price) / start_price) * 100
-                    performance[name] = {
-                        'symbol': symbol,
-                        'return': round(ytd_return, 2),
-                        'current_price': end_price
-                    }
-        
+        for i, (symbol, name, start_price, end_price) in enumerate(series):
+            if start_price > 0:
+                performance[name] = {
+                    'symbol': symbol,
+                    'return': round(float(returns[i]), 2),
+                    'current_price': end_price
+                }
+
         return performance
 
 
@@ -258,6 +590,8 @@ def get_polygon_api() -> PolygonAPI:
 def refresh_polygon_api():
     """Refresh the Polygon API instance with current settings."""
     global _api_instance
+    if _api_instance is not None:
+        _api_instance.close()
     db = get_database()
     api_key = db.get_setting('polygon_api_key') or ""
     tier = db.get_setting('polygon_tier') or "free"
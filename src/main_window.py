@@ -3,14 +3,19 @@ Main application window for Wheel Strategy Tracker.
 """
 
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel,
     QScrollArea, QFrame, QPushButton, QStackedWidget, QSplitter,
     QSizePolicy, QMenuBar, QMenu, QMessageBox, QFileDialog
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QEvent, QTimer, QObject, QRunnable, QThreadPool, Signal
 from PySide6.QtGui import QAction
 from datetime import datetime, timedelta
 import csv
+import json
+import random
+import time
+
+import numpy as np
 
 from .styles import COLORS, get_stylesheet, format_currency
 from .lib.database import get_database, set_demo_mode, is_demo_mode
@@ -25,9 +30,128 @@ from .components.market_rankings import MarketRankingsCard, TopPerformersCard
 from .components.settings_page import SettingsPage
 
 
+# Header button stylesheets, built once at import; setStyleSheet makes
+# Qt re-parse QSS every call, so the toggle just swaps cached strings.
+_DEMO_ON_QSS = f"""
+    QPushButton {{
+        background-color: {COLORS['accent_yellow']};
+        border: none;
+        color: {COLORS['bg_dark']};
+        font-weight: 600;
+        padding: 8px 16px;
+        border-radius: 6px;
+    }}
+    QPushButton:hover {{
+        background-color: #fbbf24;
+    }}
+"""
+
+_DEMO_OFF_QSS = f"""
+    QPushButton {{
+        background-color: {COLORS['accent_green_dark']};
+        border: none;
+        color: {COLORS['bg_dark']};
+        font-weight: 600;
+        padding: 8px 16px;
+        border-radius: 6px;
+    }}
+    QPushButton:hover {{
+        background-color: {COLORS['accent_green']};
+    }}
+"""
+
+_SETTINGS_BTN_QSS = f"""
+    QPushButton {{
+        background-color: transparent;
+        border: 1px solid {COLORS['border']};
+        color: {COLORS['text_secondary']};
+        padding: 8px 16px;
+        border-radius: 6px;
+    }}
+    QPushButton:hover {{
+        background-color: {COLORS['bg_hover']};
+        color: {COLORS['text_primary']};
+    }}
+"""
+
+
+# Fixed coefficient arrays for the 30-point sample chart; only the
+# current value changes between refreshes, so these are built once.
+_CHART_RAMP = np.arange(30) / 30.0
+_CHART_NOISE = (np.arange(30) % 5 - 2).astype(float)
+
+
+class _RefreshSignals(QObject):
+    """Signals for RefreshWorker (QRunnable cannot emit directly)."""
+
+    finished = Signal(dict)
+
+
+class RefreshWorker(QRunnable):
+    """Fetches dashboard data (SQLite + Polygon) off the UI thread.
+
+    The GUI thread only touches widgets in MainWindow._apply_refresh,
+    so a slow network call or query no longer freezes the UI.
+    """
+
+    def __init__(self, cached_market: dict = None):
+        super().__init__()
+        self.signals = _RefreshSignals()
+        self._cached_market = cached_market
+
+    def run(self):
+        result = {}
+        try:
+            db = get_database()
+            result['snapshot'] = db.get_dashboard_snapshot()
+            if self._cached_market is not None:
+                result['market'] = self._cached_market
+            else:
+                try:
+                    result['market'] = get_polygon_api().get_index_performance(365)
+                    result['market_fetched'] = True
+                except Exception:
+                    result['market'] = None
+        except Exception as e:
+            print(f"Refresh error: {e}")
+        self.signals.finished.emit(result)
+
+
+class _ExportSignals(QObject):
+    """Signals for ExportWorker."""
+
+    finished = Signal(bool, str)
+
+
+class ExportWorker(QRunnable):
+    """Streams the trade history to a CSV file off the UI thread."""
+
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.signals = _ExportSignals()
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            columns, rows = get_database().iter_all_trades()
+            count = 0
+            with open(self.file_path, 'w', newline='', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+            self.signals.finished.emit(True, f"Exported {count} trades to {self.file_path}")
+        except Exception as e:
+            self.signals.finished.emit(False, f"Failed to export: {str(e)}")
+
+
 class MainWindow(QMainWindow):
     """Main application window."""
-    
+
+    MARKET_CACHE_TTL = 900  # seconds; index performance barely moves in 15 min
+
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Wheel Strategy Tracker")
@@ -36,7 +160,33 @@ class MainWindow(QMainWindow):
         
         # Apply stylesheet
         self.setStyleSheet(get_stylesheet())
-        
+
+        # Refresh work runs on the shared thread pool, one job at a time;
+        # requests arriving mid-flight are re-dispatched when it finishes
+        self._refresh_in_flight = False
+        self._refresh_pending = False
+
+        # Index performance moves slowly; reuse it across the 5-minute
+        # refresh ticks instead of hitting Polygon every time.
+        self._market_cache = None
+        self._market_cache_ts = 0.0
+
+        # Per-section payload hashes from the last applied refresh, so
+        # unchanged cards skip their update_data (no relayout/repaint).
+        self._last_hashes = {}
+
+        # Date labels for the sample charts, rebuilt when the day changes
+        self._labels_day = None
+        self._chart_dates = None
+        self._bar_days = None
+
+        # Coalesce bursts of settings/trade signals into one refresh;
+        # each emission restarts the 300 ms window
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(300)
+        self._debounce_timer.timeout.connect(self._refresh_data)
+
         # Setup UI
         self._setup_menu()
         self._setup_ui()
@@ -44,10 +194,45 @@ class MainWindow(QMainWindow):
         # Load initial data
         self._refresh_data()
         
-        # Setup auto-refresh timer (every 5 minutes)
+        # Setup auto-refresh timer (every 5 minutes); paused while the
+        # window is hidden or minimized, with a catch-up on re-show
+        self._missed_refresh = False
         self.refresh_timer = QTimer(self)
         self.refresh_timer.timeout.connect(self._refresh_data)
         self.refresh_timer.start(300000)  # 5 minutes
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._resume_refresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._pause_refresh()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            if self.windowState() & Qt.WindowMinimized:
+                self._pause_refresh()
+            else:
+                self._resume_refresh()
+        super().changeEvent(event)
+
+    def _pause_refresh(self):
+        """Stop the auto-refresh while nothing is on screen."""
+        timer = getattr(self, 'refresh_timer', None)
+        if timer is not None and timer.isActive():
+            timer.stop()
+            self._missed_refresh = True
+
+    def _resume_refresh(self):
+        """Restart the auto-refresh, catching up if any tick was missed."""
+        timer = getattr(self, 'refresh_timer', None)
+        if timer is None or timer.isActive():
+            return
+        if self._missed_refresh:
+            self._missed_refresh = False
+            self._refresh_data()
+        timer.start(300000)
     
     def _setup_menu(self):
         """Setup the menu bar."""
@@ -97,10 +282,9 @@ class MainWindow(QMainWindow):
         dashboard = self._create_dashboard()
         self.stacked.addWidget(dashboard)
         
-        # Settings page
-        self.settings_page = SettingsPage()
-        self.settings_page.settings_changed.connect(self._refresh_data)
-        self.stacked.addWidget(self.settings_page)
+        # Settings page is created on first visit (_show_page); most
+        # sessions stay on the dashboard and never pay for it.
+        self.settings_page = None
     
     def _create_dashboard(self) -> QWidget:
         """Create the main dashboard page."""
@@ -121,54 +305,47 @@ class MainWindow(QMainWindow):
         header = self._create_header()
         main_layout.addLayout(header)
         
-        # Top row: Premium, Portfolio, Options cards
-        top_row = QHBoxLayout()
-        top_row.setSpacing(20)
-        
+        # All cards share one grid so a chart resize triggers a single
+        # constraint solve instead of cascading through nested rows.
+        grid = QGridLayout()
+        grid.setSpacing(20)
+
+        # Row 0: Premium, Portfolio (portfolio gets the wide columns)
         self.premium_card = PremiumCard()
         self.premium_card.setMinimumWidth(320)
         self.premium_card.setMaximumWidth(400)
-        top_row.addWidget(self.premium_card, 1)
-        
+        grid.addWidget(self.premium_card, 0, 0)
+
         self.portfolio_card = PortfolioCard()
         self.portfolio_card.data_changed.connect(self._on_portfolio_changed)
-        top_row.addWidget(self.portfolio_card, 2)  # Give portfolio more space
-        
-        main_layout.addLayout(top_row)
-        
-        # Middle row: Positions table, Charts
-        middle_row = QHBoxLayout()
-        middle_row.setSpacing(20)
-        
-        # Left column: Positions table
+        grid.addWidget(self.portfolio_card, 0, 1, 1, 2)
+
+        # Row 1: Positions table, Portfolio chart, Options income
         self.positions_table = PositionsTable()
         self.positions_table.setMinimumWidth(400)
         self.positions_table.setMaximumWidth(450)
-        middle_row.addWidget(self.positions_table)
-        
-        # Center: Portfolio chart
+        grid.addWidget(self.positions_table, 1, 0)
+
         self.portfolio_chart = PortfolioChartCard()
-        middle_row.addWidget(self.portfolio_chart, 2)
-        
-        # Right: Options income chart
+        grid.addWidget(self.portfolio_chart, 1, 1)
+
         self.options_income = OptionsIncomeCard()
         self.options_income.setMinimumWidth(300)
-        middle_row.addWidget(self.options_income, 1)
-        
-        main_layout.addLayout(middle_row)
-        
-        # Bottom row: Market rankings, Top performers
-        bottom_row = QHBoxLayout()
-        bottom_row.setSpacing(20)
-        
+        grid.addWidget(self.options_income, 1, 2)
+
+        # Row 2: Market rankings, Top performers
         self.market_rankings = MarketRankingsCard()
-        bottom_row.addWidget(self.market_rankings, 1)
-        
+        grid.addWidget(self.market_rankings, 2, 0, 1, 2)
+
         self.top_performers = TopPerformersCard()
-        bottom_row.addWidget(self.top_performers, 1)
-        
-        main_layout.addLayout(bottom_row)
-        
+        grid.addWidget(self.top_performers, 2, 2)
+
+        grid.setColumnStretch(0, 1)
+        grid.setColumnStretch(1, 2)
+        grid.setColumnStretch(2, 1)
+
+        main_layout.addLayout(grid)
+
         main_layout.addStretch()
         
         scroll.setWidget(container)
@@ -199,7 +376,7 @@ class MainWindow(QMainWindow):
         
         # Quick trade buttons
         self.quick_trade = QuickTradeButtons()
-        self.quick_trade.trade_added.connect(self._refresh_data)
+        self.quick_trade.trade_added.connect(self._request_refresh)
         header.addWidget(self.quick_trade)
         
         # Demo mode toggle
@@ -212,19 +389,7 @@ class MainWindow(QMainWindow):
         
         # Settings button
         settings_btn = QPushButton("⚙️ Settings")
-        settings_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: 1px solid {COLORS['border']};
-                color: {COLORS['text_secondary']};
-                padding: 8px 16px;
-                border-radius: 6px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['bg_hover']};
-                color: {COLORS['text_primary']};
-            }}
-        """)
+        settings_btn.setStyleSheet(_SETTINGS_BTN_QSS)
         settings_btn.clicked.connect(lambda: self._show_page(1))
         header.addWidget(settings_btn)
         
@@ -232,6 +397,10 @@ class MainWindow(QMainWindow):
     
     def _show_page(self, index: int):
         """Switch to a specific page."""
+        if index == 1 and self.settings_page is None:
+            self.settings_page = SettingsPage()
+            self.settings_page.settings_changed.connect(self._request_refresh)
+            self.stacked.addWidget(self.settings_page)
         self.stacked.setCurrentIndex(index)
     
     def _toggle_demo_mode(self):
@@ -239,6 +408,11 @@ class MainWindow(QMainWindow):
         is_demo = self.demo_toggle.isChecked()
         set_demo_mode(is_demo)
         self._update_demo_button_style()
+        # Demo/active databases differ; force a fresh market fetch and
+        # a full widget repaint regardless of payload hashes
+        self._market_cache = None
+        self._market_cache_ts = 0.0
+        self._last_hashes.clear()
         self._refresh_data()
     
     def _on_portfolio_changed(self):
@@ -248,137 +422,166 @@ class MainWindow(QMainWindow):
     def _update_demo_button_style(self):
         """Update the demo toggle button style based on state."""
         if is_demo_mode():
-            self.demo_toggle.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLORS['accent_yellow']};
-                    border: none;
-                    color: {COLORS['bg_dark']};
-                    font-weight: 600;
-                    padding: 8px 16px;
-                    border-radius: 6px;
-                }}
-                QPushButton:hover {{
-                    background-color: #fbbf24;
-                }}
-            """)
+            self.demo_toggle.setStyleSheet(_DEMO_ON_QSS)
             self.demo_toggle.setText("📊 Demo Mode")
         else:
-            self.demo_toggle.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLORS['accent_green_dark']};
-                    border: none;
-                    color: {COLORS['bg_dark']};
-                    font-weight: 600;
-                    padding: 8px 16px;
-                    border-radius: 6px;
-                }}
-                QPushButton:hover {{
-                    background-color: {COLORS['accent_green']};
-                }}
-            """)
+            self.demo_toggle.setStyleSheet(_DEMO_OFF_QSS)
             self.demo_toggle.setText("📈 Active Mode")
     
+    def _request_refresh(self):
+        """Schedule a debounced refresh (restarts the 300 ms window)."""
+        self._debounce_timer.start()
+
     def _refresh_data(self):
-        """Refresh all dashboard data."""
-        db = get_database()
-        api = get_polygon_api()
-        
+        """Kick off a dashboard refresh on the thread pool."""
+        if self._refresh_in_flight:
+            # The running worker may have read stale data (e.g. the old
+            # mode's database before a demo toggle); run again after it.
+            self._refresh_pending = True
+            return
+        self._refresh_in_flight = True
+
+        cached_market = None
+        if (self._market_cache is not None
+                and time.monotonic() - self._market_cache_ts < self.MARKET_CACHE_TTL):
+            cached_market = self._market_cache
+
+        worker = RefreshWorker(cached_market)
+        worker.signals.finished.connect(self._apply_refresh)
+        QThreadPool.globalInstance().start(worker)
+
+    def _apply_refresh(self, result: dict):
+        """Apply fetched refresh data to the widgets (GUI thread)."""
+        self._refresh_in_flight = False
+        if self._refresh_pending:
+            # A refresh was requested mid-flight (demo toggle, new trade);
+            # this result is stale — drop it and run the fresh one.
+            self._refresh_pending = False
+            self._refresh_data()
+            return
+        if not result:
+            return
+
+        if result.get('market_fetched'):
+            self._market_cache = result['market']
+            self._market_cache_ts = time.monotonic()
+
+        snap = result['snapshot']
+
         # Update timestamp
         self.subtitle_label.setText(f"Updated: {datetime.now().strftime('%b %d, %Y %I:%M %p')}")
-        
+
         # Load premium summary
-        premium_data = db.get_premium_summary()
-        self.premium_card.update_data(premium_data)
-        
-        # Refresh portfolio card
-        self.portfolio_card.refresh_data()
-        
+        premium_data = snap.premium
+        if self._payload_changed('premium', premium_data):
+            self.premium_card.update_data(premium_data)
+
+        # Refresh portfolio card from the snapshot (no re-query)
+        if self._payload_changed('portfolio', [snap.portfolio_info, snap.milestones]):
+            self.portfolio_card.refresh_data(snap.portfolio_info, snap.milestones)
+
         # Load positions
-        positions = db.get_all_positions()
-        self.positions_table.update_data(positions)
-        
-        # Calculate total portfolio value (simplified)
-        total_premium = sum(p.get('total_premium', 0) for p in positions)
-        
-        # Generate sample chart data (would be from snapshots in production)
-        chart_data = self._generate_sample_chart_data(total_premium)
-        
-        change = total_premium * 0.02  # Placeholder
-        change_pct = 2.0
-        self.portfolio_chart.update_data(total_premium, -change, -change_pct, chart_data)
-        
-        # Options income
-        week_data = self._generate_sample_bar_data()
-        self.options_income.update_data(
-            premium_data.get('ytd', 0),
-            1.14,  # Placeholder week change
-            premium_data.get('week', 0) * 0.1,  # Placeholder today
-            week_data
-        )
-        
+        positions = snap.positions
+        if self._payload_changed('positions', positions):
+            self.positions_table.update_data(positions)
+
+        # Total portfolio value (simplified) — aggregated by SQLite
+        total_premium = snap.total_premium
+
+        if self._payload_changed('chart', total_premium):
+            # Generate sample chart data (would be from snapshots in production)
+            chart_data = self._generate_sample_chart_data(total_premium)
+
+            change = total_premium * 0.02  # Placeholder
+            change_pct = 2.0
+            self.portfolio_chart.update_data(total_premium, -change, -change_pct, chart_data)
+
+        # Options income (hash the inputs; the bar data is derived)
+        if self._payload_changed('income', [premium_data.get('ytd', 0), premium_data.get('week', 0)]):
+            week_data = self._generate_sample_bar_data()
+            self.options_income.update_data(
+                premium_data.get('ytd', 0),
+                1.14,  # Placeholder week change
+                premium_data.get('week', 0) * 0.1,  # Placeholder today
+                week_data
+            )
+
         # Top performers
-        mtd_performers = db.get_top_performers('mtd', 5)
-        ytd_performers = db.get_top_performers('ytd', 5)
-        self.top_performers.update_data(mtd_performers, ytd_performers)
-        
-        # Market rankings (try to fetch from API)
-        try:
-            market_data = api.get_index_performance(365)
+        if self._payload_changed('performers', [snap.mtd, snap.ytd]):
+            self.top_performers.update_data(snap.mtd, snap.ytd)
+
+        # Market rankings (already fetched by the worker)
+        market_data = result.get('market')
+        if market_data is not None:
             options_ytd = premium_data.get('ytd', 0)
-            # Calculate percentage return (simplified)
-            options_pct = (options_ytd / 100000) * 100 if options_ytd > 0 else 0
-            self.market_rankings.update_data(options_pct, market_data)
-        except Exception:
-            # Use default data if API fails
-            pass
+            if self._payload_changed('market', [market_data, options_ytd]):
+                # Calculate percentage return (simplified)
+                options_pct = (options_ytd / 100000) * 100 if options_ytd > 0 else 0
+                self.market_rankings.update_data(options_pct, market_data)
     
+    def _payload_changed(self, key: str, payload) -> bool:
+        """Check a section payload against the last applied refresh.
+
+        Returns True (and records the new hash) when the payload differs,
+        so no-op refreshes skip the widget rebuild entirely.
+        """
+        digest = hash(json.dumps(payload, default=str, sort_keys=True))
+        if self._last_hashes.get(key) == digest:
+            return False
+        self._last_hashes[key] = digest
+        return True
+
+    def _date_labels(self) -> tuple[list, list]:
+        """Date/day labels for the sample charts, cached per calendar day."""
+        today = datetime.now().date()
+        if today != self._labels_day:
+            self._chart_dates = [(today - timedelta(days=29 - i)).strftime("%Y-%m-%d") for i in range(30)]
+            self._bar_days = [(today - timedelta(days=6 - i)).strftime("%a") for i in range(7)]
+            self._labels_day = today
+        return self._chart_dates, self._bar_days
+
     def _generate_sample_chart_data(self, current_value: float) -> list:
         """Generate sample chart data points."""
-        data = []
+        dates, _ = self._date_labels()
         base_value = current_value * 0.95
-        
-        for i in range(30):
-            date = (datetime.now() - timedelta(days=29-i)).strftime("%Y-%m-%d")
-            # Add some variation
-            variation = (i / 30) * (current_value - base_value)
-            noise = (i % 5 - 2) * (current_value * 0.005)
-            value = base_value + variation + noise
-            data.append((date, max(0, value)))
-        
-        return data
-    
+        values = base_value + _CHART_RAMP * (current_value - base_value) \
+            + _CHART_NOISE * (current_value * 0.005)
+        np.maximum(values, 0, out=values)
+        return list(zip(dates, values.tolist()))
+
     def _generate_sample_bar_data(self) -> list:
         """Generate sample bar chart data."""
-        import random
-        data = []
-        for i in range(7):
-            day = (datetime.now() - timedelta(days=6-i)).strftime("%a")
-            value = random.uniform(100, 500)
-            data.append((day, value))
-        return data
+        _, days = self._date_labels()
+        # Seed on the day so values stay stable between same-day refreshes
+        rng = random.Random(self._labels_day.toordinal())
+        return [(day, rng.uniform(100, 500)) for day in days]
     
     def _export_csv(self):
         """Export trades to CSV."""
         db = get_database()
-        trades = db.get_all_trades()
-        
-        if not trades:
+        _, cursor = db.iter_all_trades()
+        has_trades = cursor.fetchone() is not None
+        cursor.close()
+
+        if not has_trades:
             QMessageBox.information(self, "Export", "No trades to export.")
             return
-        
+
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Export Trades", "trades.csv", "CSV Files (*.csv)"
         )
-        
+
         if file_path:
-            try:
-                with open(file_path, 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=trades[0].keys())
-                    writer.writeheader()
-                    writer.writerows(trades)
-                QMessageBox.information(self, "Success", f"Exported {len(trades)} trades to {file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to export: {str(e)}")
+            worker = ExportWorker(file_path)
+            worker.signals.finished.connect(self._on_export_finished)
+            QThreadPool.globalInstance().start(worker)
+
+    def _on_export_finished(self, ok: bool, message: str):
+        """Report the export result (GUI thread)."""
+        if ok:
+            QMessageBox.information(self, "Success", message)
+        else:
+            QMessageBox.critical(self, "Error", message)
     
     def _show_about(self):
         """Show about dialog."""
@@ -3,6 +3,10 @@ Stylesheet definitions for Wheel Strategy Tracker.
 Dark theme with green accents matching the reference design.
 """
 
+from functools import lru_cache
+
+from PySide6.QtGui import QColor
+
 # Color palette
 COLORS = {
     'bg_dark': '#0d0d0d',
@@ -22,6 +26,10 @@ COLORS = {
     'accent_yellow': '#eab308',
 }
 
+# Shared QColor instances, built once so paint paths and item roles reuse
+# them instead of re-parsing hex strings per call.
+QCOLORS = {key: QColor(value) for key, value in COLORS.items()}
+
 DARK_STYLESHEET = f"""
 /* Main Window */
 QMainWindow {{
@@ -421,11 +429,16 @@ def get_stylesheet() -> str:
     return DARK_STYLESHEET
 
 
+@lru_cache(maxsize=4096)
 def format_currency(value: float) -> str:
-    """Format a value as currency."""
+    """Format a value as currency.
+
+    Called several times per row on every table refresh and repaint, and
+    premium values repeat between refreshes, so the result is memoized.
+    """
     if value >= 0:
         return f"${value:,.2f}"
-    return f"-${abs(value):,.2f}"
+    return f"-${-value:,.2f}"
 
 
 def format_percent(value: float) -> str: